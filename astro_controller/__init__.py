@@ -0,0 +1,30 @@
+"""ASTRONEER 专用服务器 RCON 客户端
+
+导入本包不会建立连接或加载 Flask，各子模块在首次访问时才导入::
+
+    from astro_controller import ServerController
+
+    controller = ServerController(verbose=False)
+    if controller.connect_to_server('127.0.0.1', 1234, 'password'):
+        print(controller.get_player_list())
+"""
+
+import importlib
+
+# 公开名称 -> 所在子模块
+_EXPORTS = {
+    'ServerController': 'client',
+    'JSONArrayStream': 'client',
+    'Tracer': 'tracing',
+    'ControllerInterface': 'interactive',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,168 @@
+"""非交互命令行 - 每个服务器输出一行JSON，便于定时任务和监控探针调用
+
+    python -m astro_controller -s 127.0.0.1:1234 -s 10.0.0.2 -p 密码 players
+    python -m astro_controller -s 密码A@10.0.0.1 -s 密码B@10.0.0.2:1234 stats
+    python -m astro_controller -s 127.0.0.1 broadcast "服务器将在10分钟后重启"
+
+服务器写作 [password@]host[:port]，未单独指定密码的服务器使用 -p 或环境变量 ASTRO_RCON_PASSWORD。
+服务器列表也可以通过 ASTRO_SERVERS（逗号分隔）提供。全部成功时返回0，任一服务器失败时返回1。
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+
+from .client import ServerController, JSONArrayStream, is_command_error
+
+DEFAULT_PORT = 1234
+
+
+def parse_server(value):
+    """解析 [password@]host[:port]，返回 (host, port, password)，未指定密码时password为None"""
+    password, _, address = value.rpartition('@')
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, DEFAULT_PORT, password or None
+    try:
+        return host, int(port), password or None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'无效的服务器地址: {address}')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='astro_controller', description='ASTRONEER 服务器 RCON 命令行')
+    parser.add_argument('-s', '--server', action='append', type=parse_server, default=[],
+                        help=f'服务器地址 [password@]host[:port]，可重复指定，默认端口 {DEFAULT_PORT}')
+    parser.add_argument('-p', '--password', default=os.environ.get('ASTRO_RCON_PASSWORD'),
+                        help='未单独指定密码的服务器使用的RCON密码，默认读取 ASTRO_RCON_PASSWORD')
+    parser.add_argument('--timeout', type=float, default=5, help='连接和命令超时(秒)')
+    parser.add_argument('--auth-wait', type=float, default=0.5, help='发送密码后等待认证的时间(秒)')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    players = commands.add_parser('players', help='玩家列表（默认只含在线玩家）')
+    players.add_argument('--all', action='store_true', help='包含离线玩家')
+    players.add_argument('--fields', help='只输出指定字段，逗号分隔')
+
+    commands.add_parser('stats', help='服务器统计信息')
+    commands.add_parser('saves', help='存档列表')
+
+    save = commands.add_parser('save', help='保存游戏')
+    save.add_argument('name', nargs='?', help='存档名称')
+
+    kick = commands.add_parser('kick', help='按GUID踢出玩家')
+    kick.add_argument('guid')
+
+    broadcast = commands.add_parser('broadcast', help='广播消息')
+    broadcast.add_argument('message')
+
+    switch = commands.add_parser('switch', help='切换存档并等待就绪，不指定名称时创建新游戏')
+    switch.add_argument('name', nargs='?')
+    switch.add_argument('--no-save', action='store_true', help='切换前不保存当前进度')
+    switch.add_argument('--wait', type=float, default=120, help='等待就绪的最长时间(秒)')
+
+    return parser
+
+
+def list_players(controller, args):
+    """流式读取玩家列表，只保留需要的玩家和字段"""
+    fields = args.fields.split(',') if args.fields else None
+    parser = JSONArrayStream('playerInfo')
+    chunks = controller.stream_command('DSListPlayers', args.timeout)
+    players = []
+    try:
+        for player in parser.iter_items(chunks):
+            if not args.all and not player.get('inGame', False):
+                continue
+            players.append({k: player[k] for k in fields if k in player} if fields else player)
+    finally:
+        chunks.close()
+
+    if not parser.complete:
+        raise RuntimeError('获取玩家列表失败' if not parser.found else f'玩家列表不完整，仅收到 {len(players)} 条')
+    return {'playerInfo': players}
+
+
+def run_command(controller, args):
+    """执行子命令，返回JSON可序列化的结果"""
+    if args.command == 'players':
+        return list_players(controller, args)
+
+    if args.command == 'switch':
+        result = controller.switch_save(args.name, not args.no_save, args.wait)
+        if not result['ready']:
+            raise RuntimeError(f"{result['error']}，当前存档: {result['activeSaveName']}")
+        return result
+
+    if args.command == 'stats':
+        result = controller.get_server_stats()
+    elif args.command == 'saves':
+        result = controller.get_save_games()
+    elif args.command == 'save':
+        result = controller.save_game(args.name)
+    elif args.command == 'kick':
+        result = controller.kick_player(args.guid)
+    else:
+        result = controller.broadcast_message(args.message)
+
+    if args.command in ('stats', 'saves') and not isinstance(result, dict):
+        raise RuntimeError(str(result))
+    if is_command_error(result):
+        raise RuntimeError(str(result))
+    return result if isinstance(result, (dict, list)) else str(result)
+
+
+def run_server(host, port, password, args):
+    """连接单个服务器并执行命令"""
+    name = f'{host}:{port}'
+    controller = ServerController(verbose=False)
+    controller.command_timeout = args.timeout
+    controller.auto_reconnect = False  # 命令执行完就退出，断线时无需重连
+    try:
+        if not controller.connect_to_server(host, port, password, args.timeout, args.auth_wait):
+            return {'server': name, 'status': 'error', 'message': controller.last_error or '连接失败'}
+        return {'server': name, 'status': 'success', 'data': run_command(controller, args)}
+    except Exception as e:
+        return {'server': name, 'status': 'error', 'message': str(e)}
+    finally:
+        if controller.rcon:
+            controller.disconnect()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    servers = args.server
+    if not servers and os.environ.get('ASTRO_SERVERS'):
+        servers = [parse_server(s.strip()) for s in os.environ['ASTRO_SERVERS'].split(',') if s.strip()]
+    if not servers:
+        parser.error('请通过 -s 或 ASTRO_SERVERS 指定服务器')
+    servers = [(host, port, password or args.password) for host, port, password in servers]
+    if not all(password for _, _, password in servers):
+        parser.error('请通过 password@host、-p 或 ASTRO_RCON_PASSWORD 提供RCON密码')
+
+    failed = False
+    output_lock = threading.Lock()
+
+    def worker(host, port, password):
+        nonlocal failed
+        result = run_server(host, port, password, args)
+        with output_lock:
+            failed = failed or result['status'] != 'success'
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+            sys.stdout.flush()
+
+    # 单个服务器时直接在主线程执行，省去创建线程的开销
+    if len(servers) == 1:
+        worker(*servers[0])
+    else:
+        threads = [threading.Thread(target=worker, args=server) for server in servers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return 1 if failed else 0
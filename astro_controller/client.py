@@ -0,0 +1,479 @@
+import socket
+import json
+import time
+import codecs
+from contextlib import contextmanager, nullcontext
+
+
+class CommandError(str):
+    """命令执行失败时send_command返回的提示文本 - 仍是str，可用isinstance与正常响应区分"""
+
+
+class CommandTimeout(CommandError):
+    """命令在超时时间内没有收到响应"""
+
+
+def is_command_error(result):
+    """判断命令结果是否失败 - 包括连接/超时错误和服务器返回的error"""
+    return isinstance(result, CommandError) or "error" in str(result).lower()
+
+
+class JSONArrayStream:
+    """增量解析RCON响应中的指定数组 - 逐个产出数组元素，不在内存中保留整个响应
+    
+    读到数组的结束符 ] 后 complete 才为True；响应被截断时 found 可能为True而 complete 为False。
+    """
+    
+    def __init__(self, key):
+        self.key = key
+        self.found = False
+        self.complete = False
+        self.envelope = {}
+        self._marker = f'"{key}"'
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._prefix = ''
+        self._suffix = []
+    
+    def iter_items(self, chunks):
+        """逐块读入原始数据，产出数组中的每个元素；结束后 envelope 保存数组以外的字段"""
+        text = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        
+        for chunk in chunks:
+            yield from self._feed(text.decode(chunk))
+        yield from self._feed(text.decode(b'', final=True), final=True)
+        
+        if self.complete:
+            try:
+                envelope = json.loads(f'{self._prefix}"{self.key}": []' + ''.join(self._suffix).rstrip())
+                envelope.pop(self.key, None)
+                self.envelope = envelope
+            except ValueError:
+                self.envelope = {}
+    
+    def _feed(self, data, final=False):
+        """追加一段文本并产出其中已完整的元素；final为True表示数据已全部读入"""
+        if self.complete:
+            self._suffix.append(data)
+            return
+        
+        self._buf += data
+        if not self.found:
+            idx = self._buf.find(self._marker)
+            bracket = self._buf.find('[', idx + len(self._marker)) if idx >= 0 else -1
+            if bracket < 0:
+                return
+            self._prefix = self._buf[:idx]
+            self._buf = self._buf[bracket + 1:]
+            self.found = True
+        
+        while True:
+            buf = self._buf.lstrip(' \t\r\n,')
+            self._buf = buf
+            if not buf:
+                return
+            if buf[0] == ']':
+                self._suffix.append(buf[1:])
+                self._buf = ''
+                self.complete = True
+                return
+            try:
+                item, end = self._decoder.raw_decode(buf)
+            except ValueError:
+                # 元素尚未接收完整，等待下一块数据
+                return
+            if end == len(buf) and not final:
+                # 后面没有分隔符时数字可能被截断，如 "12" 之后还有 "345"
+                return
+            self._buf = buf[end:]
+            yield item
+
+class ServerController:
+    """完整的服务器控制器 - 基于AstroLauncher的RCON实现"""
+    
+    def __init__(self, verbose=True):
+        self.verbose = verbose
+        self.rcon = None
+        self.connected = False
+        self.server_ip = ""
+        self.server_port = 0
+        self.password = ""
+        self.lock = False
+        self.tracer = None
+        self.command_timeout = 5  # 命令未指定timeout时使用
+        self.connect_timeout = 10
+        self.auth_wait = 0.5
+        self.auto_reconnect = True  # 流式读取中断且无法恢复时是否自动重连
+        self.last_error = None  # 最近一次连接失败的原因
+    
+    def log(self, message):
+        """输出连接状态信息 - verbose为False时静默，便于脚本解析输出"""
+        if self.verbose:
+            print(message)
+    
+    def span(self, name):
+        """性能追踪阶段 - 未设置tracer时不做任何事"""
+        if self.tracer:
+            return self.tracer.span(name)
+        return nullcontext()
+        
+    @contextmanager
+    def lock_rcon(self):
+        """RCON命令锁 - 防止并发冲突"""
+        try:
+            with self.span('lock_rcon'):
+                while self.lock:
+                    time.sleep(0.01)
+            self.lock = True
+            yield self
+        finally:
+            self.lock = False
+    
+    def connect_to_server(self, ip, port, password, timeout=10, auth_wait=0.5):
+        """连接到服务器RCON - 失败原因保存在last_error中"""
+        def fail(message):
+            self.last_error = message
+            self.log(f"❌ {message}")
+            self.close_connection()
+            return False
+        
+        try:
+            self.server_ip = ip
+            self.server_port = port
+            self.password = password
+            self.connect_timeout = timeout
+            self.auth_wait = auth_wait
+            self.last_error = None
+            
+            # 创建socket连接
+            self.rcon = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.rcon.settimeout(timeout)  # 默认10秒超时
+            
+            self.log(f"正在连接到 {ip}:{port}...")
+            self.rcon.connect((ip, port))
+            
+            # 发送认证密码
+            with self.lock_rcon():
+                self.rcon.sendall(f"{password}\n".encode())
+                time.sleep(auth_wait)  # 等待认证
+            
+            # 测试连接 - send_command只在connected时发送
+            self.connected = True
+            test_result = self.send_command("Help")
+            if test_result and not is_command_error(test_result):
+                self.log("✅ 连接成功！")
+                return True
+            else:
+                return fail(f"认证失败，请检查密码 ({test_result})")
+                
+        except socket.timeout:
+            return fail("连接超时，请检查服务器地址和端口")
+        except ConnectionRefusedError:
+            return fail("连接被拒绝，请检查服务器是否运行且RCON已启用")
+        except Exception as e:
+            return fail(f"连接失败: {e}")
+    
+    def send_command(self, command, timeout=None):
+        """发送RCON命令到服务器 - 失败时返回CommandError"""
+        timeout = timeout or self.command_timeout
+        if not self.connected or not self.rcon:
+            return CommandError("未连接到服务器")
+        
+        try:
+            with self.span('send_command'), self.lock_rcon():
+                # 发送命令
+                full_command = f"{command}\n"
+                with self.span('sendall'):
+                    self.rcon.sendall(full_command.encode())
+                
+                # 接收响应
+                with self.span('recv_all'):
+                    raw_data = self.recv_all(timeout)
+                with self.span('parse_response'):
+                    parsed_data = self.parse_response(raw_data)
+                
+                return parsed_data
+        
+        except socket.timeout:
+            # 迟到的响应会被下一条命令读到，先读掉；读不完则断开，由调用方决定是否重连
+            with self.lock_rcon():
+                if self.rcon and not self.drain_reply(timeout):
+                    self.close_connection()
+            return CommandTimeout("超时")
+        except Exception as e:
+            return CommandError(f"命令发送失败: {e}")
+    
+    def stream_command(self, command, timeout=None):
+        """发送RCON命令并逐块产出原始响应数据 - 生成器关闭前一直持有RCON锁
+        
+        生成器被提前关闭时会读完剩余响应再释放锁，避免残留数据被下一条命令读到；
+        读取超时或无法读完时断开并重新连接。
+        """
+        timeout = timeout or self.command_timeout
+        if not self.connected or not self.rcon:
+            return
+        
+        broken = False
+        try:
+            with self.span('stream_command'), self.lock_rcon():
+                finished = False
+                try:
+                    with self.span('sendall'):
+                        self.rcon.sendall(f"{command}\n".encode())
+                    with self.span('recv_iter'):
+                        for part in self.recv_iter(timeout):
+                            finished = part.endswith(b'\n')
+                            yield part
+                except OSError:
+                    broken = True
+                finally:
+                    if not finished and not broken:
+                        with self.span('drain_reply'):
+                            broken = not self.drain_reply(timeout)
+        finally:
+            if broken:
+                if self.auto_reconnect:
+                    self.reconnect()
+                else:
+                    self.close_connection()
+    
+    def recv_iter(self, timeout=None):
+        """逐块接收响应数据直到行尾 - 响应为单行JSON，超时或连接关闭时抛出异常"""
+        timeout = timeout or self.command_timeout
+        self.rcon.settimeout(timeout)
+        BUFF_SIZE = 4096
+        
+        while True:
+            part = self.rcon.recv(BUFF_SIZE)
+            if not part:
+                raise ConnectionError("连接已关闭")
+            yield part
+            if part.endswith(b'\n'):
+                return
+    
+    def drain_reply(self, timeout=None):
+        """丢弃当前响应中尚未读取的部分，成功读到行尾时返回True"""
+        timeout = timeout or self.command_timeout
+        try:
+            for _ in self.recv_iter(timeout):
+                pass
+            return True
+        except OSError:
+            return False
+    
+    def close_connection(self):
+        """关闭socket并标记为未连接 - 不输出提示，用于连接状态无法恢复时"""
+        if self.rcon:
+            self.rcon.close()
+        self.rcon = None
+        self.connected = False
+    
+    def reconnect(self):
+        """使用上次的连接信息和超时设置重新连接 - 用于连接状态无法恢复时"""
+        self.close_connection()
+        return self.connect_to_server(self.server_ip, self.server_port, self.password,
+                                      self.connect_timeout, self.auth_wait)
+    
+    def recv_all(self, timeout=None):
+        """接收所有响应数据 - 基于AstroRCON的实现，超时或接收错误时抛出异常"""
+        timeout = timeout or self.command_timeout
+        self.rcon.settimeout(timeout)
+        BUFF_SIZE = 4096
+        data = b''
+        
+        while True:
+            part = self.rcon.recv(BUFF_SIZE)
+            data += part
+            if len(part) < BUFF_SIZE:
+                break
+                
+        return data
+    
+    def parse_response(self, raw_data):
+        """解析响应数据 - 基于AstroRCON的实现"""
+        try:
+            if raw_data and raw_data != b"":
+                raw_data = raw_data.rstrip()
+                # 尝试解析JSON
+                return json.loads(raw_data.decode())
+        except:
+            # 如果不是JSON，返回原始文本
+            return raw_data.decode('utf-8', errors='ignore') if raw_data else "无响应"
+        return "无响应"
+    
+    def disconnect(self):
+        """断开连接"""
+        if self.rcon:
+            self.rcon.close()
+        self.connected = False
+        self.rcon = None
+        self.log("🔌 已断开连接")
+    
+    # 预定义命令方法 - 基于AstroLauncher的实现
+    def get_player_list(self):
+        """获取玩家列表"""
+        return self.send_command("DSListPlayers")
+    
+    def get_server_stats(self):
+        """获取服务器统计信息"""
+        return self.send_command("DSServerStatistics")
+    
+    def get_save_games(self):
+        """获取存档列表"""
+        return self.send_command("DSListGames")
+    
+    def save_game(self, save_name=None):
+        """保存游戏"""
+        if save_name:
+            return self.send_command(f"DSSaveGame {save_name}")
+        else:
+            return self.send_command("DSSaveGame")
+    
+    def broadcast_message(self, message):
+        """广播消息"""
+        return self.send_command(f"Broadcast {message}")
+    
+    def shutdown_server(self, delay=0, message=""):
+        """关闭服务器"""
+        if message:
+            return self.send_command(f"Shutdown {delay} {message}")
+        else:
+            return self.send_command("Shutdown")
+    
+    def kick_player(self, player_guid):
+        """踢出玩家"""
+        return self.send_command(f"DSKickPlayerGuid {player_guid}")
+    
+    def create_new_game(self):
+        """创建新游戏"""
+        return self.send_command("DSNewGame")
+    
+    def set_player_category(self, player_name, category):
+        """设置玩家权限类别"""
+        return self.send_command(f"SetPlayerCategoryForPlayerName {player_name} {category}")
+    
+    def ban_player(self, player_name):
+        """封禁玩家"""
+        return self.set_player_category(player_name, "Blacklisted")
+    
+    def whitelist_player(self, player_name):
+        """将玩家加入白名单"""
+        return self.set_player_category(player_name, "Whitelisted")
+    
+    def set_admin(self, player_name):
+        """给予玩家管理员权限"""
+        return self.set_player_category(player_name, "Admin")
+    
+    def load_save(self, save_name):
+        """加载指定存档"""
+        return self.send_command(f"LoadGame {save_name}")
+    
+    def get_active_save(self):
+        """获取当前存档名称，服务器未响应时返回None"""
+        saves = self.get_save_games()
+        if isinstance(saves, dict):
+            return saves.get('activeSaveName')
+        return None
+    
+    def switch_save(self, save_name=None, save_first=True, timeout=120, interval=0.25, max_interval=2.0,
+                    reload_wait=10):
+        """切换存档并等待服务器就绪 - save_name为空时创建新游戏
+        
+        依次执行 保存当前存档 → 加载/新建 → 轮询activeSaveName，轮询间隔从interval开始
+        按1.5倍递增至max_interval。返回是否就绪、当前存档、总耗时和各阶段耗时(毫秒)；
+        无法获取当前存档、保存失败或加载命令返回错误时，ready为False并在error中说明原因。
+        
+        重新加载当前存档时activeSaveName不会变化：观察到服务器无响应再恢复视为确认完成；
+        服务器在两次轮询之间就完成了加载时，最多等待reload_wait秒后返回ready为True、confirmed为False。
+        """
+        phases = {}
+        start = time.perf_counter()
+        
+        def elapsed_ms(since):
+            return round((time.perf_counter() - since) * 1000, 1)
+        
+        def finish(ready, active, polls=0, result=None, error=None, confirmed=None):
+            return {
+                'ready': ready,
+                'confirmed': ready if confirmed is None else confirmed,
+                'activeSaveName': active,
+                'previousSaveName': previous,
+                'latency_ms': elapsed_ms(start),
+                'phases': phases,
+                'polls': polls,
+                'result': result if isinstance(result, (dict, list)) or result is None else str(result),
+                'error': error
+            }
+        
+        with self.span('switch_save'):
+            previous = self.get_active_save()
+            if not previous:
+                return finish(False, None, error="无法获取当前存档，未执行切换")
+            
+            if save_first:
+                phase_start = time.perf_counter()
+                with self.span('save'):
+                    saved = self.save_game()
+                phases['save'] = elapsed_ms(phase_start)
+                if is_command_error(saved):
+                    return finish(False, previous, result=saved, error=f"保存当前存档失败，未执行切换: {saved}")
+            
+            phase_start = time.perf_counter()
+            with self.span('load'):
+                if save_name:
+                    result = self.load_save(save_name)
+                else:
+                    result = self.create_new_game()
+            phases['load'] = elapsed_ms(phase_start)
+            # 超时可能只是服务器正忙于加载，继续轮询；其他错误直接返回
+            if is_command_error(result) and not isinstance(result, CommandTimeout):
+                return finish(False, previous, result=result, error=f"加载存档失败: {result}")
+            
+            # 轮询直到activeSaveName变为目标存档（新游戏则为与之前不同的存档）
+            reload = save_name == previous
+            went_unready = False
+            phase_start = time.perf_counter()
+            deadline = phase_start + timeout
+            reload_deadline = phase_start + min(reload_wait, timeout)
+            polls = 0
+            active = None
+            ready = False
+            confirmed = None
+            with self.span('wait_ready'):
+                while time.perf_counter() < deadline:
+                    polls += 1
+                    if not self.connected:
+                        self.reconnect()
+                    active = self.get_active_save()
+                    if not active:
+                        went_unready = True
+                    elif not save_name:
+                        ready = active != previous
+                    elif active == save_name:
+                        if not reload or went_unready:
+                            ready = True
+                        elif time.perf_counter() >= reload_deadline:
+                            ready, confirmed = True, False
+                    if ready:
+                        break
+                    time.sleep(min(interval, max(deadline - time.perf_counter(), 0)))
+                    interval = min(interval * 1.5, max_interval)
+            phases['wait'] = elapsed_ms(phase_start)
+        
+        return finish(ready, active, polls, result, None if ready else "等待服务器就绪超时", confirmed)
+    
+    def rename_save(self, old_name, new_name):
+        """重命名存档"""
+        return self.send_command(f"DSRenameGame {old_name} {new_name}")
+    
+    def delete_save(self, save_name):
+        """删除存档"""
+        return self.send_command(f"DSDeleteGame {save_name}")
+    
+    def set_save_interval(self, milliseconds):
+        """设置自动保存间隔"""
+        return self.send_command(f"DSSetAutoSaveInterval {milliseconds}")
+    
+    def enable_whitelist(self, enable):
+        """启用或禁用白名单"""
+        return self.send_command(f"DSSetWhitelistEnabled {1 if enable else 0}")
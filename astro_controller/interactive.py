@@ -0,0 +1,423 @@
+import time
+import socket
+
+from .client import ServerController
+
+
+class ControllerInterface:
+    """控制器用户界面"""
+    
+    def __init__(self):
+        self.controller = ServerController()
+        self.running = True
+    
+    def clear_screen(self):
+        """清屏"""
+        print("\n" * 50)
+    
+    def show_banner(self):
+        """显示横幅"""
+        banner = """
+╔══════════════════════════════════════════════════════════════╗
+║                    ASTRONEER 服务器控制器                      ║
+║                 十分感谢 AstroLauncher RCON                   ║
+╚══════════════════════════════════════════════════════════════╝
+        """
+        print(banner)
+    
+    def get_connection_info(self):
+        """获取连接信息"""
+        self.clear_screen()
+        self.show_banner()
+        
+        print("请输入服务器连接信息：")
+        print("-" * 50)
+        
+        # 获取服务器IP
+        while True:
+            ip = input("服务器IP地址 (默认: 127.0.0.1): ").strip()
+            if not ip:
+                ip = "127.0.0.1"
+            if self.is_valid_ip(ip):
+                break
+            print("❌ 无效的IP地址，请重新输入")
+        
+        # 获取端口
+        while True:
+            port_str = input("RCON端口 (默认: 25575): ").strip()
+            if not port_str:
+                port = 25575
+            else:
+                try:
+                    port = int(port_str)
+                    if 1 <= port <= 65535:
+                        break
+                    else:
+                        print("❌ 端口号必须在1-65535之间")
+                except ValueError:
+                    print("❌ 请输入有效的端口号")
+        
+        # 获取密码
+        password = input("RCON密码: ").strip()
+        if not password:
+            print("❌ 密码不能为空")
+            return False
+        
+        return ip, port, password
+    
+    def is_valid_ip(self, ip):
+        """验证IP地址格式"""
+        try:
+            socket.inet_aton(ip)
+            return True
+        except socket.error:
+            return False
+    
+    def show_control_panel(self):
+        """显示控制面板"""
+        self.clear_screen()
+        self.show_banner()
+        
+        print(f"📍 已连接到: {self.controller.server_ip}:{self.controller.server_port}")
+        print("=" * 60)
+        
+        menu_items = [
+            ("1", "📊 服务器状态", self.show_server_status),
+            ("2", "👥 玩家列表", self.show_player_list),
+            ("3", "💾 存档列表", self.show_save_games),
+            ("4", "💾 保存游戏", self.save_current_game),
+            ("5", "📢 广播消息", self.broadcast_message),
+            ("6", "🆕 创建新游戏", self.create_new_game),
+            ("7", "👢 踢出玩家", self.kick_player),
+            ("8", "� 封禁玩家", self.ban_player),
+            ("9", "✅ 白名单玩家", self.whitelist_player),
+            ("10", "👑 设置管理员", self.set_admin),
+            ("11", "�🔄 切换存档", self.switch_save),
+            ("12", "🔄 重启服务器", self.restart_server),
+            ("13", "⏹️  关闭服务器", self.shutdown_server),
+            ("0", "🔌 断开连接", self.disconnect),
+            ("help", "❓ 显示帮助", self.show_help),
+            ("clear", "🧹 清屏", self.clear_screen)
+        ]
+        
+        print("可用命令:")
+        print("-" * 40)
+        for key, description, _ in menu_items:
+            print(f"  {key:6} - {description}")
+        print("-" * 40)
+    
+    def show_server_status(self):
+        """显示服务器状态"""
+        print("\n🔄 获取服务器状态中...")
+        stats = self.controller.get_server_stats()
+        
+        print("\n📊 服务器状态:")
+        print("-" * 30)
+        if isinstance(stats, dict):
+            for key, value in stats.items():
+                print(f"  {key}: {value}")
+        else:
+            print(f"  {stats}")
+    
+    def show_player_list(self):
+        """显示玩家列表"""
+        print("\n🔄 获取玩家列表中...")
+        players = self.controller.get_player_list()
+        
+        print("\n👥 在线玩家:")
+        print("-" * 40)
+        if isinstance(players, dict) and 'playerInfo' in players:
+            online_players = [p for p in players['playerInfo'] if p.get('inGame', False)]
+            if online_players:
+                for i, player in enumerate(online_players, 1):
+                    name = player.get('playerName', '未知')
+                    guid = player.get('playerGuid', '未知')[:8] + "..."
+                    print(f"  {i}. {name} (GUID: {guid})")
+            else:
+                print("  🎯 没有在线玩家")
+        else:
+            print(f"  ❌ 获取玩家列表失败: {players}")
+    
+    def show_save_games(self):
+        """显示存档列表"""
+        print("\n🔄 获取存档列表中...")
+        saves = self.controller.get_save_games()
+        
+        print("\n💾 存档列表:")
+        print("-" * 50)
+        if isinstance(saves, dict) and 'gameList' in saves:
+            for i, save in enumerate(saves['gameList'], 1):
+                name = save.get('name', '未知')
+                date = save.get('date', '未知日期')
+                active = " ✅ 当前存档" if save.get('name') == saves.get('activeSaveName') else ""
+                print(f"  {i}. {name} - {date}{active}")
+        else:
+            print(f"  ❌ 获取存档列表失败: {saves}")
+    
+    def save_current_game(self):
+        """保存当前游戏"""
+        save_name = input("输入存档名称 (直接回车使用默认名称): ").strip()
+        print("\n💾 保存游戏中...")
+        
+        if save_name:
+            result = self.controller.save_game(save_name)
+        else:
+            result = self.controller.save_game()
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 游戏保存成功！")
+        else:
+            print(f"❌ 保存失败: {result}")
+    
+    def broadcast_message(self):
+        """广播消息"""
+        message = input("请输入要广播的消息: ").strip()
+        if not message:
+            print("❌ 消息不能为空")
+            return
+        
+        print(f"\n📢 发送广播: {message}")
+        result = self.controller.broadcast_message(message)
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 广播发送成功！")
+        else:
+            print(f"❌ 广播发送失败: {result}")
+    
+    def create_new_game(self):
+        """创建新游戏"""
+        confirm = input("⚠️  确定要创建新游戏吗？当前进度将丢失！(y/N): ").strip().lower()
+        if confirm == 'y':
+            print("\n🆕 创建新游戏中...")
+            result = self.controller.create_new_game()
+            if result and "error" not in str(result).lower():
+                print("✅ 新游戏创建成功！")
+            else:
+                print(f"❌ 创建失败: {result}")
+        else:
+            print("❌ 操作已取消")
+    
+    def kick_player(self):
+        """踢出玩家"""
+        self.show_player_list()
+        player_guid = input("\n请输入要踢出玩家的GUID: ").strip()
+        if not player_guid:
+            print("❌ GUID不能为空")
+            return
+        
+        print(f"\n👢 踢出玩家 {player_guid}...")
+        result = self.controller.kick_player(player_guid)
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 玩家已被踢出！")
+        else:
+            print(f"❌ 踢出失败: {result}")
+    
+    def restart_server(self):
+        """重启服务器"""
+        delay = input("重启延迟时间(秒，默认10): ").strip()
+        message = input("重启消息 (直接回车跳过): ").strip()
+        
+        try:
+            delay = int(delay) if delay else 10
+        except:
+            delay = 10
+        
+        print(f"\n🔄 准备重启服务器...")
+        result = self.controller.shutdown_server(delay, message)
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 重启命令已发送！")
+        else:
+            print(f"❌ 重启命令发送失败: {result}")
+    
+    def shutdown_server(self):
+        """关闭服务器"""
+        confirm = input("⚠️  确定要关闭服务器吗？(y/N): ").strip().lower()
+        if confirm == 'y':
+            delay = input("关闭延迟时间(秒，默认10): ").strip()
+            message = input("关闭消息 (直接回车跳过): ").strip()
+            
+            try:
+                delay = int(delay) if delay else 10
+            except:
+                delay = 10
+            
+            print(f"\n⏹️  准备关闭服务器...")
+            result = self.controller.shutdown_server(delay, message)
+            
+            if result and "error" not in str(result).lower():
+                print("✅ 服务器关闭命令已发送！")
+                # 给服务器关闭留出时间
+                time.sleep(delay + 2)
+                self.disconnect()
+            else:
+                print(f"❌ 关闭失败: {result}")
+        else:
+            print("❌ 操作已取消")
+    
+    def ban_player(self):
+        """封禁玩家"""
+        self.show_player_list()
+        player_name = input("\n请输入要封禁的玩家名称: ").strip()
+        if not player_name:
+            print("❌ 玩家名称不能为空")
+            return
+        
+        print(f"\n🚫 封禁玩家 {player_name}...")
+        result = self.controller.ban_player(player_name)
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 玩家已被封禁！")
+        else:
+            print(f"❌ 封禁失败: {result}")
+    
+    def whitelist_player(self):
+        """将玩家加入白名单"""
+        player_name = input("请输入要加入白名单的玩家名称: ").strip()
+        if not player_name:
+            print("❌ 玩家名称不能为空")
+            return
+        
+        print(f"\n✅ 将玩家 {player_name} 加入白名单...")
+        result = self.controller.whitelist_player(player_name)
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 玩家已被加入白名单！")
+        else:
+            print(f"❌ 操作失败: {result}")
+    
+    def set_admin(self):
+        """给予玩家管理员权限"""
+        self.show_player_list()
+        player_name = input("\n请输入要给予管理员权限的玩家名称: ").strip()
+        if not player_name:
+            print("❌ 玩家名称不能为空")
+            return
+        
+        print(f"\n👑 给予玩家 {player_name} 管理员权限...")
+        result = self.controller.set_admin(player_name)
+        
+        if result and "error" not in str(result).lower():
+            print("✅ 玩家已获得管理员权限！")
+        else:
+            print(f"❌ 操作失败: {result}")
+    
+    def switch_save(self):
+        """切换存档"""
+        self.show_save_games()
+        save_name = input("\n请输入要切换的存档名称: ").strip()
+        if not save_name:
+            print("❌ 存档名称不能为空")
+            return
+        
+        confirm = input(f"⚠️  确定要切换到存档 '{save_name}' 吗？当前未保存的进度将丢失！(y/N): ").strip().lower()
+        if confirm != 'y':
+            print("❌ 操作已取消")
+            return
+        
+        print(f"\n🔄 保存当前进度并切换到存档 {save_name}，等待服务器就绪...")
+        result = self.controller.switch_save(save_name)
+        
+        if result['ready']:
+            phases = ", ".join(f"{k} {v / 1000:.1f}秒" for k, v in result['phases'].items())
+            print(f"✅ 存档切换成功！耗时 {result['latency_ms'] / 1000:.1f}秒 ({phases})")
+            if not result['confirmed']:
+                print("⚠️  未能确认服务器已重新加载该存档")
+        else:
+            print(f"❌ {result['error']}，当前存档: {result['activeSaveName']}")
+    
+    def disconnect(self):
+        """断开连接"""
+        self.controller.disconnect()
+        self.running = False
+    
+    def show_help(self):
+        """显示帮助"""
+        print("""
+///
+        """)
+        input("\n按回车键继续...")
+    
+    def process_command(self, command):
+        """处理用户命令"""
+        command_map = {
+            '1': self.show_server_status,
+            '2': self.show_player_list,
+            '3': self.show_save_games,
+            '4': self.save_current_game,
+            '5': self.broadcast_message,
+            '6': self.create_new_game,
+            '7': self.kick_player,
+            '8': self.ban_player,
+            '9': self.whitelist_player,
+            '10': self.set_admin,
+            '11': self.switch_save,
+            '12': self.restart_server,
+            '13': self.shutdown_server,
+            '0': self.disconnect,
+            'help': self.show_help,
+            'clear': self.clear_screen,
+            'disconnect': self.disconnect
+        }
+        
+        if command in command_map:
+            try:
+                command_map[command]()
+            except Exception as e:
+                print(f"❌ 执行命令时出错: {e}")
+        else:
+            print("❌ 未知命令，输入 'help' 查看帮助")
+    
+    def run(self):
+        """运行控制器"""
+        try:
+            # 获取连接信息
+            connection_info = self.get_connection_info()
+            if not connection_info:
+                return
+            
+            ip, port, password = connection_info
+            
+            # 尝试连接
+            if not self.controller.connect_to_server(ip, port, password):
+                input("\n按回车键退出...")
+                return
+            
+            # 主循环
+            while self.running and self.controller.connected:
+                try:
+                    self.show_control_panel()
+                    command = input("\n请输入命令编号: ").strip().lower()
+                    
+                    if command in ['quit', 'exit', '0', 'disconnect']:
+                        self.disconnect()
+                        break
+                    
+                    self.process_command(command)
+                    
+                    if self.running and self.controller.connected:
+                        input("\n按回车键继续...")
+                        
+                except KeyboardInterrupt:
+                    print("\n\n⚠️  检测到中断信号...")
+                    confirm = input("确定要退出吗？(y/N): ").strip().lower()
+                    if confirm == 'y':
+                        self.disconnect()
+                        break
+                except Exception as e:
+                    print(f"❌ 发生错误: {e}")
+                    input("\n按回车键继续...")
+            
+        except Exception as e:
+            print(f"❌ 程序运行出错: {e}")
+        
+        finally:
+            if self.controller.connected:
+                self.controller.disconnect()
+            print("\n👋 感谢使用ASTRONEER服务器控制器！")
+
+def main():
+    """主函数"""
+    controller = ControllerInterface()
+    controller.run()
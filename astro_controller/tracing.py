@@ -0,0 +1,152 @@
+import os
+import time
+import json
+import logging
+import threading
+from contextlib import contextmanager
+
+
+class Span:
+    """追踪中的一个阶段"""
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.start = time.perf_counter()
+        self.end = None
+
+    @property
+    def duration_ms(self):
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'ms': round(self.duration_ms, 3),
+            'children': [child.to_dict() for child in self.children]
+        }
+
+
+class Tracer:
+    """轻量级请求追踪 - 记录 Flask → RCON锁 → socket → 解析 各阶段耗时"""
+
+    def __init__(self, slow_ms=1000, log_path='slow_requests.log', profile_every=0, profile_dir='profiles'):
+        self.slow_ms = slow_ms
+        self.profile_every = profile_every
+        self.profile_dir = profile_dir
+        self.local = threading.local()
+        self.counter = 0
+        self.counter_lock = threading.Lock()
+        self.profile_lock = threading.Lock()
+        self.log_path = log_path
+        self.log_lock = threading.Lock()
+        # 每个Tracer使用独立的logger，不注册到全局logging，也不向上传播
+        self.logger = logging.Logger('astro.slow_requests', logging.INFO)
+        self.logger.propagate = False
+
+    def log_slow(self, record):
+        """写入慢请求日志 - 首次写入时才打开日志文件，log_path为空时不记录"""
+        if not self.log_path:
+            return
+        if not self.logger.handlers:
+            with self.log_lock:
+                if not self.logger.handlers:
+                    self.logger.addHandler(logging.FileHandler(self.log_path, encoding='utf-8'))
+        self.logger.info(json.dumps(record, ensure_ascii=False))
+
+    @classmethod
+    def from_env(cls):
+        """从环境变量读取配置"""
+        return cls(
+            slow_ms=float(os.environ.get('ASTRO_TRACE_SLOW_MS', 1000)),
+            log_path=os.environ.get('ASTRO_TRACE_LOG', 'slow_requests.log'),
+            profile_every=int(os.environ.get('ASTRO_PROFILE_EVERY', 0)),
+            profile_dir=os.environ.get('ASTRO_PROFILE_DIR', 'profiles')
+        )
+
+    @property
+    def trace_id(self):
+        return getattr(self.local, 'trace_id', None)
+
+    def start_trace(self, name):
+        """开始一次追踪，按采样率决定是否同时启用profiler"""
+        self.local.trace_id = os.urandom(8).hex()
+        self.local.root = Span(name)
+        self.local.current = self.local.root
+        self.local.profiler = None
+
+        with self.counter_lock:
+            self.counter += 1
+            sampled = self.profile_every > 0 and self.counter % self.profile_every == 0
+
+        # cProfile 同一时刻只能有一个在运行
+        if sampled and self.profile_lock.acquire(blocking=False):
+            import cProfile
+            self.local.profiler = cProfile.Profile()
+            self.local.profiler.enable()
+
+        return self.local.trace_id
+
+    def finish_trace(self):
+        """结束追踪，慢请求写入日志，返回span树"""
+        root = getattr(self.local, 'root', None)
+        if root is None:
+            return None
+        root.end = time.perf_counter()
+
+        profiler = self.local.profiler
+        if profiler:
+            profiler.disable()
+            self.profile_lock.release()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, f'{self.trace_id}.prof'))
+
+        tree = root.to_dict()
+        if root.duration_ms >= self.slow_ms:
+            self.log_slow({
+                'trace_id': self.trace_id,
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'spans': tree
+            })
+
+        self.local.root = None
+        self.local.current = None
+        self.local.profiler = None
+        return tree
+
+    @contextmanager
+    def span(self, name):
+        """记录一个子阶段 - 当前线程没有进行中的追踪时不做任何事"""
+        parent = getattr(self.local, 'current', None)
+        if parent is None:
+            yield None
+            return
+
+        span = Span(name, parent)
+        parent.children.append(span)
+        self.local.current = span
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            self.local.current = parent
+
+    def server_timing(self):
+        """生成 Server-Timing 响应头，浏览器开发者工具可直接显示各阶段耗时"""
+        root = getattr(self.local, 'root', None)
+        if root is None:
+            return ''
+
+        entries = []
+
+        def walk(span):
+            entries.append(f'{span.name.replace(" ", "_")};dur={span.duration_ms:.2f}')
+            for child in span.children:
+                walk(child)
+
+        for child in root.children:
+            walk(child)
+        entries.append(f'total;dur={root.duration_ms:.2f}')
+        return ', '.join(entries)
@@ -0,0 +1,70 @@
+import json
+
+from astro_controller.client import JSONArrayStream
+
+
+def split_at(data, offset):
+    return [data[:offset], data[offset:]]
+
+
+def parse(key, chunks):
+    parser = JSONArrayStream(key)
+    items = list(parser.iter_items(chunks))
+    return parser, items
+
+
+def test_objects_split_at_every_offset():
+    reply = {
+        'activeSaveName': '存档A',
+        'gameList': [{'name': '存档A', 'date': '2024'}, {'name': 'B', 'date': '2025'}],
+        'tail': 1
+    }
+    data = (json.dumps(reply, ensure_ascii=False) + '\r\n').encode()
+
+    for offset in range(len(data) + 1):
+        parser, items = parse('gameList', split_at(data, offset))
+        assert items == reply['gameList'], offset
+        assert parser.complete
+        assert parser.envelope == {'activeSaveName': '存档A', 'tail': 1}
+
+
+def test_scalars_split_at_every_offset():
+    data = b'{"gameList": [12345, 678, "ab", true, null]}\r\n'
+
+    for offset in range(len(data) + 1):
+        parser, items = parse('gameList', split_at(data, offset))
+        assert items == [12345, 678, 'ab', True, None], offset
+        assert parser.complete
+
+
+def test_byte_by_byte():
+    players = [{'playerName': f'玩家{i}', 'inGame': i % 2 == 0} for i in range(20)]
+    data = (json.dumps({'playerInfo': players}, ensure_ascii=False) + '\r\n').encode()
+
+    parser, items = parse('playerInfo', [data[i:i + 1] for i in range(len(data))])
+    assert items == players
+    assert parser.complete
+
+
+def test_truncated_stream_is_incomplete():
+    players = [{'playerName': f'p{i}', 'inGame': True} for i in range(200)]
+    data = json.dumps({'playerInfo': players}).encode()
+
+    parser, items = parse('playerInfo', [data[:1000]])
+    assert parser.found
+    assert not parser.complete
+    assert items == players[:len(items)]
+    assert len(items) < len(players)
+
+
+def test_truncated_scalar_is_incomplete():
+    parser, items = parse('gameList', [b'{"gameList": [12'])
+    assert parser.found
+    assert not parser.complete
+
+
+def test_missing_key():
+    parser, items = parse('playerInfo', [b'\xe8\xb6\x85\xe6\x97\xb6'])
+    assert items == []
+    assert not parser.found
+    assert not parser.complete
@@ -1,22 +1,53 @@
-from flask import Flask, render_template, request, jsonify, session
-import threading
-import time
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, session, g, Response, stream_with_context
+from werkzeug.local import LocalProxy
 import json
 
-# 导入现有的ServerController类
-from ServerController import ServerController
+from astro_controller.client import ServerController, JSONArrayStream
+from astro_controller.tracing import Tracer
 
-app = Flask(__name__)
-app.secret_key = 'your_secret_key'  # 用于会话管理
+bp = Blueprint('controller', __name__)
 
-# 全局服务器控制器实例
-server_controller = ServerController()
+# 当前应用的服务器控制器和追踪器 - 由create_app创建，导入本模块时不会创建任何实例
+server_controller = LocalProxy(lambda: current_app.extensions['astro_controller'])
+tracer = LocalProxy(lambda: current_app.extensions['astro_tracer'])
 
-@app.route('/')
+def create_app(controller=None, tracer=None):
+    """创建Flask应用 - 追踪器默认通过环境变量配置慢请求阈值和采样profiler"""
+    app = Flask(__name__)
+    app.secret_key = 'your_secret_key'  # 用于会话管理
+    
+    tracer = tracer or Tracer.from_env()
+    controller = controller or ServerController()
+    controller.tracer = tracer
+    app.extensions['astro_controller'] = controller
+    app.extensions['astro_tracer'] = tracer
+    
+    app.register_blueprint(bp)
+    return app
+
+@bp.before_app_request
+def start_trace():
+    tracer.start_trace(f'{request.method} {request.path}')
+
+@bp.after_app_request
+def add_trace_headers(response):
+    response.headers['X-Trace-Id'] = tracer.trace_id or ''
+    # 流式响应的阶段耗时在响应体发送时才产生，只记录在慢请求日志中
+    if not g.get('trace_streaming'):
+        response.headers['Server-Timing'] = tracer.server_timing()
+    return response
+
+@bp.teardown_app_request
+def finish_trace(exc):
+    # 流式响应在生成器结束时再结束追踪
+    if not g.get('trace_streaming'):
+        tracer.finish_trace()
+
+@bp.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/connect', methods=['POST'])
+@bp.route('/connect', methods=['POST'])
 def connect():
     data = request.json
     ip = data.get('ip')
@@ -38,19 +69,27 @@ def connect():
         session['connected'] = True
         return jsonify({'status': 'success', 'message': '连接成功'})
     else:
-        return jsonify({'status': 'error', 'message': '连接失败，请检查服务器信息和密码'})
+        return jsonify({'status': 'error', 'message': server_controller.last_error or '连接失败，请检查服务器信息和密码'})
 
-@app.route('/disconnect')
+@bp.route('/disconnect')
 def disconnect():
     server_controller.disconnect()
     session.pop('connected', None)
     return jsonify({'status': 'success', 'message': '已断开连接'})
 
-@app.route('/status')
+@bp.route('/status')
 def status():
     return jsonify({'connected': server_controller.connected})
 
-@app.route('/command', methods=['POST'])
+def to_bool(value, default=False):
+    """解析请求中的布尔参数 - 兼容 "false"/"0" 等字符串"""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() not in ('', 'false', '0', 'no', 'off')
+    return bool(value)
+
+@bp.route('/command', methods=['POST'])
 def execute_command():
     if not server_controller.connected:
         return jsonify({'status': 'error', 'message': '未连接到服务器'})
@@ -89,6 +128,14 @@ def execute_command():
             result = server_controller.load_save(save_name)
         elif command_type == 'create_new_game':
             result = server_controller.create_new_game()
+        elif command_type == 'switch_save':
+            # 保存→加载/新建→等待就绪，name为空时创建新游戏
+            save_name = params.get('name') or None
+            save_first = to_bool(params.get('saveFirst'), True)
+            timeout = float(params.get('timeout', 120))
+            result = server_controller.switch_save(save_name, save_first, timeout)
+            if not result['ready']:
+                return jsonify({'status': 'error', 'message': result['error'], 'data': result})
         elif command_type == 'shutdown_server':
             delay = params.get('delay', 0)
             message = params.get('message', '')
@@ -105,5 +152,123 @@ def execute_command():
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'命令执行失败: {e}'})
 
+@bp.route('/profiling', methods=['GET', 'POST'])
+def profiling():
+    """查看或修改profiler采样率 - every为N时每N个请求采样一次，0为关闭"""
+    if request.method == 'POST':
+        try:
+            every = int(request.json.get('every', 0))
+        except (TypeError, ValueError):
+            return jsonify({'status': 'error', 'message': 'every必须是数字'})
+        if every < 0:
+            return jsonify({'status': 'error', 'message': 'every不能为负数'})
+        tracer.profile_every = every
+    
+    return jsonify({
+        'status': 'success',
+        'every': tracer.profile_every,
+        'dir': tracer.profile_dir,
+        'slow_ms': tracer.slow_ms
+    })
+
+# 可流式输出的命令: 命令类型 -> (RCON命令, 响应中的数组字段)
+STREAM_COMMANDS = {
+    'get_player_list': ('DSListPlayers', 'playerInfo'),
+    'get_save_games': ('DSListGames', 'gameList'),
+}
+
+def filter_item(item, in_game=False, fields=None):
+    """按在线状态和字段筛选单个元素，不满足条件时返回None"""
+    if not isinstance(item, dict):
+        return item
+    if in_game and not item.get('inGame', False):
+        return None
+    if fields:
+        return {k: item[k] for k in fields if k in item}
+    return item
+
+@bp.route('/command/stream', methods=['POST'])
+def execute_command_stream():
+    """流式执行命令 - 逐个输出玩家/存档条目，内存占用与列表长度无关"""
+    if not server_controller.connected:
+        return jsonify({'status': 'error', 'message': '未连接到服务器'})
+    
+    data = request.json
+    command_type = data.get('type')
+    params = data.get('params', {})
+    
+    if command_type not in STREAM_COMMANDS:
+        return jsonify({'status': 'error', 'message': '该命令不支持流式输出'})
+    
+    command, key = STREAM_COMMANDS[command_type]
+    in_game = to_bool(params.get('inGame'))
+    fields = params.get('fields') or None
+    # 兼容逗号分隔的字符串，与命令行的 --fields 一致
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+    elif fields is not None and not (isinstance(fields, list) and all(isinstance(f, str) for f in fields)):
+        return jsonify({'status': 'error', 'message': 'fields必须是字符串列表或逗号分隔的字符串'})
+    ndjson = params.get('format') == 'ndjson'
+    
+    def generate():
+        try:
+            yield from generate_items()
+        finally:
+            tracer.finish_trace()
+    
+    def generate_items():
+        parser = JSONArrayStream(key)
+        chunks = server_controller.stream_command(command)
+        started = False
+        count = 0
+        # status放在末尾，响应被截断时仍可输出error
+        opening = '' if ndjson else f'{{"data": {{{json.dumps(key)}: ['
+        
+        try:
+            with server_controller.span('stream'):
+                for item in parser.iter_items(chunks):
+                    item = filter_item(item, in_game, fields)
+                    if item is None:
+                        continue
+                    if not started:
+                        yield opening
+                        started = True
+                    if ndjson:
+                        yield json.dumps(item, ensure_ascii=False) + '\n'
+                    else:
+                        yield (', ' if count else '') + json.dumps(item, ensure_ascii=False)
+                    count += 1
+        finally:
+            chunks.close()
+        
+        if not parser.found:
+            error = {'status': 'error', 'message': f'响应中未找到 {key}'}
+            yield json.dumps(error, ensure_ascii=False) + ('\n' if ndjson else '')
+            return
+        
+        if parser.complete:
+            status = {'status': 'success'}
+            meta = parser.envelope
+        else:
+            status = {'status': 'error', 'message': f'响应不完整，仅收到 {count} 条'}
+            meta = {}
+        
+        if ndjson:
+            summary = dict(status, count=count)
+            if parser.complete:
+                summary['meta'] = meta
+            yield json.dumps(summary, ensure_ascii=False) + '\n'
+        else:
+            if not started:
+                yield opening
+            extra = ''.join(f', {json.dumps(k)}: {json.dumps(v, ensure_ascii=False)}'
+                            for k, v in meta.items())
+            trailer = json.dumps(status, ensure_ascii=False)[1:]
+            yield f']{extra}}}, {trailer}'
+    
+    g.trace_streaming = True
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file